@@ -4,8 +4,15 @@ Configuration classes for the crawl4ai_llm package.
 This module defines Pydantic models for various configuration options.
 """
 
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
-from pydantic import BaseModel, Field
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Shared by all config models: immutable, so the instance returned by
+# get_config() can't be altered in place, and validators are built on first
+# use rather than at import time.
+_MODEL_CONFIG = ConfigDict(frozen=True, defer_build=True)
 
 
 class StorageConfig(BaseModel):
@@ -21,6 +28,8 @@ class StorageConfig(BaseModel):
         filename_template: Template for generating filenames (JSON storage only)
     """
     
+    model_config = _MODEL_CONFIG
+    
     type: str = Field("json", description="Storage type")
     path: str = Field("./data", description="Storage path or connection string")
     use_uuid: bool = Field(True, description="Use UUIDs for product IDs")
@@ -46,6 +55,8 @@ class CrawlerConfig(BaseModel):
         verify_ssl: Whether to verify SSL certificates
     """
     
+    model_config = _MODEL_CONFIG
+    
     user_agent: str = Field(
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/91.0.4472.124 Safari/537.36",
@@ -76,6 +87,8 @@ class LLMConfig(BaseModel):
         cache_dir: Directory for caching LLM responses
     """
     
+    model_config = _MODEL_CONFIG
+    
     provider: str = Field("openai", description="LLM provider")
     model: str = Field("gpt-4", description="Model name")
     api_key: Optional[str] = Field(None, description="API key")
@@ -99,10 +112,26 @@ class AppConfig(BaseModel):
         log_level: Logging level
     """
     
+    model_config = _MODEL_CONFIG
+    
     storage: StorageConfig = Field(default_factory=StorageConfig, description="Storage configuration")
     crawler: CrawlerConfig = Field(default_factory=CrawlerConfig, description="Crawler configuration")
     llm: LLMConfig = Field(default_factory=LLMConfig, description="LLM configuration")
     log_level: str = Field("INFO", description="Logging level")
     
     # Additional settings
-    settings: Dict[str, Any] = Field(default_factory=dict, description="Additional settings")
\ No newline at end of file
+    settings: Dict[str, Any] = Field(default_factory=dict, description="Additional settings")
+
+
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """
+    Get the process-wide application configuration.
+    
+    The configuration is built on first access and cached, so repeated calls
+    return the same instance without re-running Pydantic validation.
+    
+    Returns:
+        AppConfig: The application configuration.
+    """
+    return AppConfig()
@@ -68,10 +68,3 @@ class ProductData(BaseModel):
     extracted_at: Optional[datetime] = Field(default_factory=datetime.now, description="Extraction timestamp")
     source_html: Optional[str] = Field(None, description="Source HTML content")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
-    
-    class Config:
-        """Pydantic model configuration."""
-        
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat()
-        }
\ No newline at end of file
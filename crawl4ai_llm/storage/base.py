@@ -3,7 +3,7 @@ Base interface and exceptions for storage implementations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 
 
 class StorageError(Exception):
@@ -175,6 +175,7 @@ class BaseStorage(ABC):
         page_size: int = 100,
         sort_by: Optional[str] = None,
         sort_order: str = "asc",
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         List products with optional filtering, pagination, and sorting.
@@ -185,6 +186,8 @@ class BaseStorage(ABC):
             page_size: Number of products per page.
             sort_by: Field to sort products by.
             sort_order: Sort order, either "asc" or "desc".
+            fields: Product fields to include in the results. If None, full
+                    products are returned.
 
         Returns:
             Dict[str, Any]: Dictionary containing:
@@ -197,4 +200,32 @@ class BaseStorage(ABC):
         Raises:
             StorageConnectionError: If there's an error connecting to the storage.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def iter_products(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "asc",
+        batch_size: int = 100,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over products with optional filtering and sorting.
+
+        Implementations are async generators, so results can be consumed with
+        ``async for`` without materializing the full result set.
+
+        Args:
+            filters: Dictionary of field-value pairs to filter products by.
+            sort_by: Field to sort products by.
+            sort_order: Sort order, either "asc" or "desc".
+            batch_size: Number of products to load from storage at a time.
+
+        Yields:
+            Dict[str, Any]: The product data.
+
+        Raises:
+            StorageConnectionError: If there's an error connecting to the storage.
+        """
+        pass
@@ -6,7 +6,8 @@ the storage configuration. Supported storage types include JSON file storage.
 """
 
 import logging
-from typing import Optional, Dict, Any
+import os
+from typing import Dict, Any, Tuple
 
 from ..config import StorageConfig
 from .base import BaseStorage
@@ -19,14 +20,18 @@ STORAGE_REGISTRY = {
     "json": JSONStorage,
 }
 
-# Singleton storage instance
-_storage_instance: Optional[BaseStorage] = None
+# Storage instances, pooled by storage type and path
+_storage_instances: Dict[Tuple[str, str], BaseStorage] = {}
 
 
 async def get_storage(config: StorageConfig) -> BaseStorage:
     """
     Get or create a storage instance based on the configuration.
     
+    Instances are pooled per storage type and resolved path, so every call
+    for the same storage location shares one instance and its locks, however
+    the path is spelled.
+    
     Args:
         config: Storage configuration.
         
@@ -36,28 +41,27 @@ async def get_storage(config: StorageConfig) -> BaseStorage:
     Raises:
         ValueError: If the storage type is unknown.
     """
-    global _storage_instance
-    
-    # Return the singleton instance if it already exists
-    if _storage_instance is not None:
-        return _storage_instance
-    
     # Get the storage implementation class
     storage_type = config.type.lower()
     if storage_type not in STORAGE_REGISTRY:
         raise ValueError(f"Unknown storage type: {storage_type}")
     
+    # Reuse the pooled instance for this storage location if there is one
+    key = (storage_type, os.path.realpath(config.path))
+    storage = _storage_instances.get(key)
+    if storage is not None:
+        return storage
+    
     storage_class = STORAGE_REGISTRY[storage_type]
     
     # Extract the configuration parameters
     params: Dict[str, Any] = {}
     if storage_type == "json":
-        params["directory"] = config.json_directory
-        if config.lock_timeout:
-            params["lock_timeout"] = config.lock_timeout
+        params["directory"] = config.path
     
     # Create the storage instance
-    logger.info(f"Initializing {storage_type} storage")
-    _storage_instance = storage_class(**params)
+    logger.info("Initializing %s storage at %s", storage_type, config.path)
+    storage = storage_class(**params)
+    _storage_instances[key] = storage
     
-    return _storage_instance
\ No newline at end of file
+    return storage
@@ -3,11 +3,16 @@ JSON file-based storage implementation.
 """
 
 import asyncio
+import hashlib
 import json
+import math
 import os
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Set
+from typing import AsyncIterator, Dict, List, Any, Optional, Set, Tuple
+
+import orjson
 
 from .base import (
     BaseStorage,
@@ -17,6 +22,59 @@ from .base import (
     DuplicateProductError,
 )
 
+# Product fields copied into the index for filtering and sorting
+INDEX_FIELDS = ("sku", "url", "store_name", "title")
+
+# Fields every index entry carries in addition to INDEX_FIELDS
+_INDEX_ENTRY_FIELDS = frozenset(("id", "metadata") + INDEX_FIELDS)
+
+# Sentinel for absent fields, so None can still be matched as a filter value
+_MISSING = object()
+
+# Maps every digit to "0" so runs of 20 or more digits, which may be integers
+# too wide for orjson, can be found with a plain substring search
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGIT_RUN = b"0" * 20
+
+
+def _copy_json(value: Any) -> Any:
+    """
+    Deep-copy a decoded JSON value.
+    
+    JSON documents only nest dicts and lists, so this is much cheaper than
+    ``copy.deepcopy`` for the same result.
+    
+    Args:
+        value: The decoded JSON value.
+        
+    Returns:
+        Any: A copy sharing no dicts or lists with the original.
+    """
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+def _has_non_finite(value: Any) -> bool:
+    """
+    Check a JSON value for NaN or infinite floats.
+    
+    Args:
+        value: The JSON value to check.
+        
+    Returns:
+        bool: True if any float in the value is NaN or infinite.
+    """
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
 
 class JSONStorage(BaseStorage):
     """
@@ -26,7 +84,7 @@ class JSONStorage(BaseStorage):
     for quick lookups and filtering.
     """
 
-    def __init__(self, directory: str, use_file_locks: bool = True):
+    def __init__(self, directory: str, use_file_locks: bool = True, max_concurrency: int = 32):
         """
         Initialize the JSON storage.
         
@@ -35,6 +93,8 @@ class JSONStorage(BaseStorage):
             use_file_locks: Whether to use file locks for concurrent operations.
                             Set to False for better performance when concurrent
                             access is not a concern.
+            max_concurrency: Maximum number of file operations a batch operation
+                             runs at once.
         
         Raises:
             StorageConnectionError: If the directory doesn't exist or can't be accessed.
@@ -43,6 +103,14 @@ class JSONStorage(BaseStorage):
         self.use_file_locks = use_file_locks
         self.index_path = os.path.join(self.directory, "index.json")
         self.lock = asyncio.Lock()
+        self.max_concurrency = max_concurrency
+        self._io_semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Parsed index keyed by the index file's (inode, mtime, size) signature,
+        # with whether it needed the standard library decoder
+        self._index_cache: Optional[
+            Tuple[Tuple[int, int, int], Dict[str, Dict[str, Any]], bool]
+        ] = None
         
         # Create the directory if it doesn't exist
         try:
@@ -53,8 +121,8 @@ class JSONStorage(BaseStorage):
         # Initialize the index file if it doesn't exist
         if not os.path.exists(self.index_path):
             try:
-                with open(self.index_path, "w") as f:
-                    json.dump({}, f)
+                with open(self.index_path, "wb") as f:
+                    f.write(b"{}")
             except (OSError, PermissionError) as e:
                 raise StorageConnectionError(f"Failed to create index file: {e}")
 
@@ -65,7 +133,7 @@ class JSONStorage(BaseStorage):
         The ID is generated based on the following hierarchy:
         1. If 'id' is present in the product data, use it.
         2. Otherwise, generate an ID based on SKU + store name if available.
-        3. Otherwise, generate an ID based on URL if available.
+        3. Otherwise, generate an ID from a digest of the URL if available.
         4. Otherwise, generate a random UUID.
         
         Args:
@@ -82,9 +150,10 @@ class JSONStorage(BaseStorage):
         if "sku" in product_data and "store_name" in product_data:
             return f"{product_data['store_name']}_{product_data['sku']}"
         
-        # Generate ID based on URL if available
+        # Generate ID based on URL if available. A digest is used rather than
+        # hash(), which is randomized per process and so not a stable ID.
         if "url" in product_data:
-            return f"url_{hash(product_data['url'])}"
+            return f"url_{hashlib.sha256(str(product_data['url']).encode()).hexdigest()[:16]}"
         
         # Generate a random UUID as a last resort
         return str(uuid.uuid4())
@@ -101,10 +170,283 @@ class JSONStorage(BaseStorage):
         """
         return os.path.join(self.directory, f"{product_id}.json")
 
-    async def _load_index(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    def _build_index_entry(product_id: str, product_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the index entry for a product.
+        
+        The entry holds the ID, the metadata and whichever of INDEX_FIELDS the
+        product has, built in a single pass over the fixed field list.
+        
+        Args:
+            product_id: The ID of the product.
+            product_data: Dictionary containing product data.
+            
+        Returns:
+            Dict[str, Any]: The index entry.
+        """
+        entry = {"id": product_id, "metadata": product_data["metadata"]}
+        entry.update(
+            (field, product_data[field]) for field in INDEX_FIELDS if field in product_data
+        )
+        return entry
+
+    @staticmethod
+    def _read_json_document(path: str) -> Tuple[Any, bool]:
+        """
+        Read and decode a JSON file in a single pass.
+        
+        orjson rejects the NaN and Infinity literals the standard library
+        writes, so documents it can't decode are retried with ``json.loads``.
+        orjson also reads integers wider than 64 bits as floats, losing
+        precision. Documents containing a run of 20 or more digits therefore
+        go straight to ``json.loads``. Long digit strings send a document the
+        slower way too, but still decode exactly.
+        
+        Args:
+            path: Path to the JSON file.
+            
+        Returns:
+            Tuple[Any, bool]: The decoded JSON document, and whether it needed
+                              the standard library decoder.
+        
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        with open(path, "rb") as f:
+            raw = f.read()
+        if _LONG_DIGIT_RUN in raw.translate(_DIGITS_TO_ZERO):
+            return json.loads(raw), True
+        try:
+            return orjson.loads(raw), False
+        except orjson.JSONDecodeError:
+            return json.loads(raw), True
+
+    @classmethod
+    def _read_json_file(cls, path: str) -> Any:
+        """
+        Read and decode a JSON file in a single pass.
+        
+        Args:
+            path: Path to the JSON file.
+            
+        Returns:
+            Any: The decoded JSON document.
+        
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        return cls._read_json_document(path)[0]
+
+    @staticmethod
+    def _write_json_file(path: str, data: Any, use_stdlib: bool = False) -> None:
+        """
+        Encode data to JSON once and atomically replace the file with it.
+        
+        The document is written to a temporary file in the same directory and
+        moved into place with ``os.replace``, so readers never observe a
+        partially written file and every write gives the file a new inode.
+        
+        orjson writes NaN and infinite floats as null. New product data with
+        such values is rejected before it gets here, but existing documents
+        written by the standard library may still hold them. Callers pass
+        ``use_stdlib`` for those so their values are kept. Data orjson refuses
+        to encode falls back to ``json.dumps`` as well.
+        
+        Args:
+            path: Path to the JSON file.
+            data: The data to encode.
+            use_stdlib: Whether to encode with ``json.dumps`` instead of orjson.
+        """
+        encoded = None
+        if not use_stdlib:
+            try:
+                encoded = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+            except orjson.JSONEncodeError:
+                # Integers wider than 64 bits and lone surrogates
+                pass
+        if encoded is None:
+            encoded = json.dumps(data).encode()
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """
+        Remove a file, treating an already missing file as removed.
+        
+        Attempting the removal directly avoids a separate existence check and
+        the race between checking and removing.
+        
+        Args:
+            path: Path to the file.
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the index file, reusing the cached copy while the file is unchanged.
+        
+        The cache is keyed by the file's inode, modification time and size.
+        Index writes replace the file atomically, so a write from this or any
+        other instance sharing the directory invalidates the cached copy.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: The product index. This is the cached
+                                       mapping itself and must not be modified.
+        """
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return {}
+        if stat.st_size == 0:
+            return {}
+        
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._index_cache
+        if cached is None or cached[0] != signature:
+            cached = (signature, *self._read_json_document(self.index_path))
+            self._index_cache = cached
+        
+        return cached[1]
+
+    @staticmethod
+    async def _call_in_executor(func, *args) -> Any:
+        """
+        Run a blocking function in the default executor.
+        
+        The worker thread can't be interrupted, so if the caller is cancelled
+        while the function runs, the cancellation is held back until the
+        function finishes. Cancelled I/O therefore never completes after the
+        caller has moved on.
+        
+        Args:
+            func: The blocking function to run.
+            *args: Positional arguments for the function.
+            
+        Returns:
+            Any: The function's return value.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, func, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    async def _run_io(self, func, *args) -> Any:
+        """
+        Run blocking file I/O in the default executor with bounded concurrency.
+        
+        Args:
+            func: The blocking function to run.
+            *args: Positional arguments for the function.
+            
+        Returns:
+            Any: The function's return value.
+        """
+        async with self._io_semaphore:
+            return await self._call_in_executor(func, *args)
+
+    async def _gather_io(self, func, calls: List[Tuple[Any, ...]]) -> List[Any]:
+        """
+        Run a blocking I/O function once per argument tuple, stopping at the first failure.
+        
+        Calls run concurrently, bounded by ``max_concurrency`` so a large batch
+        cannot flood the shared executor. Unlike a bare ``asyncio.gather``, a
+        failure does not leave the rest of the batch running unobserved. Calls
+        that have not started yet are never started. Calls already running in
+        the executor can't be interrupted, so they are waited for. The same
+        applies if the caller is cancelled. When this method returns or raises,
+        no I/O from the batch is still in progress, but calls that completed
+        are not undone.
+        
+        Args:
+            func: The blocking function to run.
+            calls: Positional arguments for each call.
+            
+        Returns:
+            List[Any]: The results, in the same order as the input.
+        """
+        stopped = False
+        
+        async def run(args: Tuple[Any, ...]) -> Any:
+            nonlocal stopped
+            async with self._io_semaphore:
+                if stopped:
+                    # The batch already failed or was cancelled
+                    raise asyncio.CancelledError()
+                try:
+                    return await self._call_in_executor(func, *args)
+                except Exception:
+                    # Flag the failure before the slot is released, so no
+                    # queued call starts before the batch is cancelled
+                    stopped = True
+                    raise
+        
+        tasks = [asyncio.ensure_future(run(args)) for args in calls]
+        if not tasks:
+            return []
+        
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        except asyncio.CancelledError:
+            stopped = True
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        
+        return [task.result() for task in tasks]
+
+    @asynccontextmanager
+    async def _index_lock(self) -> AsyncIterator[None]:
+        """
+        Hold the storage lock across an index read-modify-write.
+        
+        Mutating methods must load, change and save the index inside this
+        context so that concurrent writers cannot overwrite each other's
+        entries. Reads need no lock because the index is replaced atomically.
+        """
+        if self.use_file_locks:
+            async with self.lock:
+                yield
+        else:
+            yield
+
+    async def _load_index(self, for_update: bool = False) -> Dict[str, Dict[str, Any]]:
         """
         Load the product index from the index file.
         
+        By default the cached index is returned as-is, so read-only callers pay
+        nothing for it and must not modify it. Mutating methods pass
+        ``for_update=True`` to get a shallow copy of the mapping. They may add,
+        replace and remove entries in it, but must never modify an entry in
+        place, since entries are still shared with the cache.
+        
+        Args:
+            for_update: Whether to return a copy the caller can modify.
+        
         Returns:
             Dict[str, Dict[str, Any]]: The product index.
         
@@ -112,25 +454,10 @@ class JSONStorage(BaseStorage):
             StorageConnectionError: If the index file can't be loaded.
         """
         try:
-            if self.use_file_locks:
-                async with self.lock:
-                    # Use blocking file I/O in a thread pool
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, 
-                        lambda: json.load(open(self.index_path, "r")) 
-                              if os.path.exists(self.index_path) and os.path.getsize(self.index_path) > 0 
-                              else {}
-                    )
-            else:
-                # Use blocking file I/O in a thread pool
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(
-                    None, 
-                    lambda: json.load(open(self.index_path, "r")) 
-                          if os.path.exists(self.index_path) and os.path.getsize(self.index_path) > 0 
-                          else {}
-                )
+            # Use blocking file I/O in a thread pool
+            loop = asyncio.get_running_loop()
+            index = await loop.run_in_executor(None, self._read_index)
+            return dict(index) if for_update else index
         except json.JSONDecodeError:
             # If the index file is corrupted, return an empty index
             return {}
@@ -147,22 +474,21 @@ class JSONStorage(BaseStorage):
         Raises:
             StorageConnectionError: If the index file can't be saved.
         """
+        # An index that needed the standard library decoder may hold values
+        # orjson can't write back faithfully, so keep using the standard library
+        cached = self._index_cache
+        use_stdlib = cached is not None and cached[2]
+        
         try:
-            if self.use_file_locks:
-                async with self.lock:
-                    # Use blocking file I/O in a thread pool
-                    loop = asyncio.get_event_loop()
-                    await loop.run_in_executor(
-                        None, 
-                        lambda: json.dump(index, open(self.index_path, "w"))
-                    )
-            else:
-                # Use blocking file I/O in a thread pool
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    None, 
-                    lambda: json.dump(index, open(self.index_path, "w"))
-                )
+            # Use blocking file I/O in a thread pool
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None, 
+                self._write_json_file,
+                self.index_path,
+                index,
+                use_stdlib,
+            )
         except (OSError, PermissionError) as e:
             raise StorageConnectionError(f"Failed to save index: {e}")
 
@@ -178,8 +504,12 @@ class JSONStorage(BaseStorage):
         
         Raises:
             DuplicateProductError: If a product with the same ID already exists.
+            ValueError: If the product data contains NaN or infinite values.
             StorageConnectionError: If there's an error connecting to the storage.
         """
+        if _has_non_finite(product_data):
+            raise ValueError("Product data must not contain NaN or infinite values")
+            
         # Generate a unique ID for the product
         product_id = self._get_product_id(product_data)
         
@@ -187,38 +517,34 @@ class JSONStorage(BaseStorage):
         product_data["id"] = product_id
         
         # Add metadata
+        now = datetime.now().isoformat()
         product_data["metadata"] = product_data.get("metadata", {})
-        product_data["metadata"]["created_at"] = datetime.now().isoformat()
-        product_data["metadata"]["updated_at"] = datetime.now().isoformat()
-        
-        # Check if the product already exists
-        index = await self._load_index()
-        if product_id in index:
-            raise DuplicateProductError(f"Product with ID '{product_id}' already exists")
+        product_data["metadata"]["created_at"] = now
+        product_data["metadata"]["updated_at"] = now
         
-        # Save the product to a file
-        file_path = self._get_file_path(product_id)
-        try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None, 
-                lambda: json.dump(product_data, open(file_path, "w"))
-            )
-        except (OSError, PermissionError) as e:
-            raise StorageConnectionError(f"Failed to save product: {e}")
-        
-        # Update the index
-        index[product_id] = {
-            "id": product_id,
-            "metadata": product_data["metadata"],
-        }
-        
-        # Add key fields to the index for filtering
-        for field in ["sku", "url", "store_name", "title"]:
-            if field in product_data:
-                index[product_id][field] = product_data[field]
-        
-        await self._save_index(index)
+        async with self._index_lock():
+            # Check if the product already exists
+            index = await self._load_index(for_update=True)
+            if product_id in index:
+                raise DuplicateProductError(f"Product with ID '{product_id}' already exists")
+            
+            # Save the product to a file
+            file_path = self._get_file_path(product_id)
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, 
+                    self._write_json_file,
+                    file_path,
+                    product_data,
+                )
+            except (OSError, PermissionError) as e:
+                raise StorageConnectionError(f"Failed to save product: {e}")
+            
+            # Update the index
+            index[product_id] = self._build_index_entry(product_id, product_data)
+            
+            await self._save_index(index)
         
         return product_id
 
@@ -234,66 +560,66 @@ class JSONStorage(BaseStorage):
         
         Raises:
             DuplicateProductError: If a product with the same ID already exists.
+            ValueError: If any product data contains NaN or infinite values.
             StorageConnectionError: If there's an error connecting to the storage.
         """
         if not products_data:
             return []
             
+        for i, product_data in enumerate(products_data):
+            if _has_non_finite(product_data):
+                raise ValueError(f"Product data at index {i} must not contain NaN or infinite values")
+            
         # Generate unique IDs for all products and check for duplicates
         product_ids = []
-        index = await self._load_index()
-        existing_ids = set(index.keys())
-        
-        # Prepare products with IDs and metadata
-        prepared_products = []
-        
-        for product_data in products_data:
-            product_id = self._get_product_id(product_data)
+        async with self._index_lock():
+            index = await self._load_index(for_update=True)
+            existing_ids = set(index.keys())
             
-            if product_id in existing_ids:
-                raise DuplicateProductError(f"Product with ID '{product_id}' already exists")
+            # Prepare products with IDs and metadata
+            prepared_products = []
+            now = datetime.now().isoformat()
+            
+            for product_data in products_data:
+                product_id = self._get_product_id(product_data)
                 
-            # Add the ID to the product data
-            product_data_copy = product_data.copy()
-            product_data_copy["id"] = product_id
-            
-            # Add metadata
-            product_data_copy["metadata"] = product_data_copy.get("metadata", {})
-            product_data_copy["metadata"]["created_at"] = datetime.now().isoformat()
-            product_data_copy["metadata"]["updated_at"] = datetime.now().isoformat()
-            
-            product_ids.append(product_id)
-            prepared_products.append(product_data_copy)
-            
-            # Update the index entry
-            index[product_id] = {
-                "id": product_id,
-                "metadata": product_data_copy["metadata"],
-            }
-            
-            # Add key fields to the index for filtering
-            for field in ["sku", "url", "store_name", "title"]:
-                if field in product_data_copy:
-                    index[product_id][field] = product_data_copy[field]
-        
-        # Save all products to files
-        try:
-            loop = asyncio.get_event_loop()
-            tasks = []
-            
-            for product_id, product_data in zip(product_ids, prepared_products):
-                file_path = self._get_file_path(product_id)
-                tasks.append(loop.run_in_executor(
-                    None,
-                    lambda p=product_data, f=file_path: json.dump(p, open(f, "w"))
-                ))
+                if product_id in existing_ids:
+                    raise DuplicateProductError(f"Product with ID '{product_id}' already exists")
+                    
+                # Add the ID to the product data
+                product_data_copy = product_data.copy()
+                product_data_copy["id"] = product_id
                 
-            await asyncio.gather(*tasks)
-        except (OSError, PermissionError) as e:
-            raise StorageConnectionError(f"Failed to save products: {e}")
-        
-        # Update the index with all new products
-        await self._save_index(index)
+                # Add metadata
+                product_data_copy["metadata"] = product_data_copy.get("metadata", {})
+                product_data_copy["metadata"]["created_at"] = now
+                product_data_copy["metadata"]["updated_at"] = now
+                
+                product_ids.append(product_id)
+                prepared_products.append(product_data_copy)
+                
+                # Update the index
+                index[product_id] = self._build_index_entry(product_id, product_data_copy)
+            
+            # Save all products to files
+            file_paths = [self._get_file_path(product_id) for product_id in product_ids]
+            try:
+                await self._gather_io(
+                    self._write_json_file, list(zip(file_paths, prepared_products))
+                )
+            except BaseException as e:
+                # None of the batch is indexed yet, so remove what was written,
+                # including when the caller was cancelled
+                await asyncio.gather(
+                    *(self._run_io(self._remove_file, file_path) for file_path in file_paths),
+                    return_exceptions=True,
+                )
+                if isinstance(e, OSError):
+                    raise StorageConnectionError(f"Failed to save products: {e}")
+                raise
+            
+            # Update the index with all new products
+            await self._save_index(index)
         
         return product_ids
 
@@ -314,16 +640,17 @@ class JSONStorage(BaseStorage):
         file_path = self._get_file_path(product_id)
         
         try:
-            if not os.path.exists(file_path):
-                raise ProductNotFoundError(f"Product with ID '{product_id}' not found")
-                
-            loop = asyncio.get_event_loop()
+            # Missing files surface from the read itself, off the event loop
+            loop = asyncio.get_running_loop()
             product_data = await loop.run_in_executor(
                 None, 
-                lambda: json.load(open(file_path, "r"))
+                self._read_json_file,
+                file_path,
             )
             
             return product_data
+        except FileNotFoundError:
+            raise ProductNotFoundError(f"Product with ID '{product_id}' not found")
         except json.JSONDecodeError as e:
             raise StorageError(f"Invalid JSON in product file: {e}")
         except (OSError, PermissionError) as e:
@@ -346,37 +673,33 @@ class JSONStorage(BaseStorage):
         if not product_ids:
             return []
             
-        # Check which products exist
-        missing_ids = []
-        file_paths = {}
-        
-        for product_id in product_ids:
-            file_path = self._get_file_path(product_id)
-            if not os.path.exists(file_path):
-                missing_ids.append(product_id)
-            else:
-                file_paths[product_id] = file_path
-                
+        # Retrieve all products in parallel; missing files surface from the reads
+        # themselves, so no existence checks run on the event loop
+        results = await asyncio.gather(
+            *(
+                self._run_io(self._read_json_file, self._get_file_path(product_id))
+                for product_id in product_ids
+            ),
+            return_exceptions=True,
+        )
+        
+        missing_ids = [
+            product_id
+            for product_id, result in zip(product_ids, results)
+            if isinstance(result, FileNotFoundError)
+        ]
         if missing_ids:
             raise ProductNotFoundError(f"Products with IDs '{', '.join(missing_ids)}' not found")
             
-        # Retrieve all products in parallel
-        try:
-            loop = asyncio.get_event_loop()
-            tasks = []
-            
-            for product_id in product_ids:
-                file_path = file_paths[product_id]
-                tasks.append(loop.run_in_executor(
-                    None,
-                    lambda f=file_path: json.load(open(f, "r"))
-                ))
-                
-            return await asyncio.gather(*tasks)
-        except json.JSONDecodeError as e:
-            raise StorageError(f"Invalid JSON in product file: {e}")
-        except (OSError, PermissionError) as e:
-            raise StorageConnectionError(f"Failed to retrieve products: {e}")
+        for result in results:
+            if isinstance(result, json.JSONDecodeError):
+                raise StorageError(f"Invalid JSON in product file: {result}")
+            if isinstance(result, (OSError, PermissionError)):
+                raise StorageConnectionError(f"Failed to retrieve products: {result}")
+            if isinstance(result, BaseException):
+                raise result
+        
+        return results
 
     async def update_product(self, product_data: Dict[str, Any]) -> str:
         """
@@ -390,51 +713,51 @@ class JSONStorage(BaseStorage):
         
         Raises:
             ProductNotFoundError: If the product is not found.
-            ValueError: If the product_data doesn't contain an 'id' field.
+            ValueError: If the product_data doesn't contain an 'id' field or
+                        contains NaN or infinite values.
             StorageConnectionError: If there's an error connecting to the storage.
         """
         if "id" not in product_data:
             raise ValueError("Product data must include 'id' field")
+        if _has_non_finite(product_data):
+            raise ValueError("Product data must not contain NaN or infinite values")
             
         product_id = str(product_data["id"])
-        index = await self._load_index()
-        
-        if product_id not in index:
-            raise ProductNotFoundError(f"Product with ID '{product_id}' not found")
+        async with self._index_lock():
+            index = await self._load_index(for_update=True)
             
-        # Get the existing product to merge with the updates
-        existing_product = await self.get_product(product_id)
-        
-        # Update the product data
-        updated_product = {**existing_product, **product_data}
-        
-        # Update metadata
-        updated_product["metadata"] = updated_product.get("metadata", {})
-        updated_product["metadata"]["updated_at"] = datetime.now().isoformat()
-        
-        # Save the updated product
-        file_path = self._get_file_path(product_id)
-        try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None, 
-                lambda: json.dump(updated_product, open(file_path, "w"))
-            )
-        except (OSError, PermissionError) as e:
-            raise StorageConnectionError(f"Failed to update product: {e}")
-        
-        # Update the index
-        index[product_id] = {
-            "id": product_id,
-            "metadata": updated_product["metadata"],
-        }
-        
-        # Add key fields to the index for filtering
-        for field in ["sku", "url", "store_name", "title"]:
-            if field in updated_product:
-                index[product_id][field] = updated_product[field]
-        
-        await self._save_index(index)
+            if product_id not in index:
+                raise ProductNotFoundError(f"Product with ID '{product_id}' not found")
+                
+            # Get the existing product to merge with the updates
+            existing_product = await self.get_product(product_id)
+            
+            # Update the product data
+            updated_product = {**existing_product, **product_data}
+            
+            # Update metadata
+            updated_product["metadata"] = updated_product.get("metadata", {})
+            updated_product["metadata"]["updated_at"] = datetime.now().isoformat()
+            
+            # Save the updated product
+            file_path = self._get_file_path(product_id)
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, 
+                    self._write_json_file,
+                    file_path,
+                    updated_product,
+                    # Existing data may predate the check for non-finite values
+                    _has_non_finite(updated_product),
+                )
+            except (OSError, PermissionError) as e:
+                raise StorageConnectionError(f"Failed to update product: {e}")
+            
+            # Update the index
+            index[product_id] = self._build_index_entry(product_id, updated_product)
+            
+            await self._save_index(index)
         
         return product_id
 
@@ -450,7 +773,8 @@ class JSONStorage(BaseStorage):
         
         Raises:
             ProductNotFoundError: If any of the products are not found.
-            ValueError: If any product_data doesn't contain an 'id' field.
+            ValueError: If any product_data doesn't contain an 'id' field or
+                        contains NaN or infinite values.
             StorageConnectionError: If there's an error connecting to the storage.
         """
         if not products_data:
@@ -461,63 +785,55 @@ class JSONStorage(BaseStorage):
         for i, product_data in enumerate(products_data):
             if "id" not in product_data:
                 raise ValueError(f"Product data at index {i} must include 'id' field")
+            if _has_non_finite(product_data):
+                raise ValueError(f"Product data at index {i} must not contain NaN or infinite values")
             product_ids.append(str(product_data["id"]))
             
-        # Check which products exist
-        index = await self._load_index()
-        missing_ids = [pid for pid in product_ids if pid not in index]
-        
-        if missing_ids:
-            raise ProductNotFoundError(f"Products with IDs '{', '.join(missing_ids)}' not found")
-            
-        # Get all existing products to merge with updates
-        existing_products = await self.get_products(product_ids)
-        
-        # Prepare updates
-        updates = []
-        now = datetime.now().isoformat()
-        
-        for i, (product_id, product_data, existing_product) in enumerate(
-            zip(product_ids, products_data, existing_products)
-        ):
-            # Update the product data
-            updated_product = {**existing_product, **product_data}
+        async with self._index_lock():
+            # Check which products exist
+            index = await self._load_index(for_update=True)
+            missing_ids = [pid for pid in product_ids if pid not in index]
             
-            # Update metadata
-            updated_product["metadata"] = updated_product.get("metadata", {})
-            updated_product["metadata"]["updated_at"] = now
+            if missing_ids:
+                raise ProductNotFoundError(f"Products with IDs '{', '.join(missing_ids)}' not found")
+                
+            # Get all existing products to merge with updates
+            existing_products = await self.get_products(product_ids)
             
-            updates.append(updated_product)
+            # Prepare updates
+            updates = []
+            now = datetime.now().isoformat()
             
-            # Update the index
-            index[product_id] = {
-                "id": product_id,
-                "metadata": updated_product["metadata"],
-            }
+            for i, (product_id, product_data, existing_product) in enumerate(
+                zip(product_ids, products_data, existing_products)
+            ):
+                # Update the product data
+                updated_product = {**existing_product, **product_data}
+                
+                # Update metadata
+                updated_product["metadata"] = updated_product.get("metadata", {})
+                updated_product["metadata"]["updated_at"] = now
+                
+                updates.append(updated_product)
+                
+                # Update the index
+                index[product_id] = self._build_index_entry(product_id, updated_product)
             
-            # Add key fields to the index for filtering
-            for field in ["sku", "url", "store_name", "title"]:
-                if field in updated_product:
-                    index[product_id][field] = updated_product[field]
-        
-        # Save all updated products to files
-        try:
-            loop = asyncio.get_event_loop()
-            tasks = []
-            
-            for product_id, updated_product in zip(product_ids, updates):
-                file_path = self._get_file_path(product_id)
-                tasks.append(loop.run_in_executor(
-                    None,
-                    lambda p=updated_product, f=file_path: json.dump(p, open(f, "w"))
-                ))
+            # Save all updated products to files
+            try:
+                calls = []
                 
-            await asyncio.gather(*tasks)
-        except (OSError, PermissionError) as e:
-            raise StorageConnectionError(f"Failed to update products: {e}")
-        
-        # Update the index with all updated products
-        await self._save_index(index)
+                for product_id, updated_product in zip(product_ids, updates):
+                    file_path = self._get_file_path(product_id)
+                    # Existing data may predate the check for non-finite values
+                    calls.append((file_path, updated_product, _has_non_finite(updated_product)))
+                    
+                await self._gather_io(self._write_json_file, calls)
+            except (OSError, PermissionError) as e:
+                raise StorageConnectionError(f"Failed to update products: {e}")
+            
+            # Update the index with all updated products
+            await self._save_index(index)
         
         return product_ids
 
@@ -535,23 +851,23 @@ class JSONStorage(BaseStorage):
             ProductNotFoundError: If the product is not found.
             StorageConnectionError: If there's an error connecting to the storage.
         """
-        index = await self._load_index()
-        
-        if product_id not in index:
-            raise ProductNotFoundError(f"Product with ID '{product_id}' not found")
+        async with self._index_lock():
+            index = await self._load_index(for_update=True)
             
-        # Remove the product file
-        file_path = self._get_file_path(product_id)
-        try:
-            if os.path.exists(file_path):
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, os.remove, file_path)
-        except (OSError, PermissionError) as e:
-            raise StorageConnectionError(f"Failed to delete product: {e}")
-        
-        # Update the index
-        del index[product_id]
-        await self._save_index(index)
+            if product_id not in index:
+                raise ProductNotFoundError(f"Product with ID '{product_id}' not found")
+                
+            # Remove the product file
+            file_path = self._get_file_path(product_id)
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._remove_file, file_path)
+            except (OSError, PermissionError) as e:
+                raise StorageConnectionError(f"Failed to delete product: {e}")
+            
+            # Update the index
+            del index[product_id]
+            await self._save_index(index)
         
         return True
 
@@ -572,37 +888,27 @@ class JSONStorage(BaseStorage):
         if not product_ids:
             return 0
             
-        index = await self._load_index()
-        
-        # Check which products exist
-        missing_ids = [pid for pid in product_ids if pid not in index]
-        
-        if missing_ids:
-            raise ProductNotFoundError(f"Products with IDs '{', '.join(missing_ids)}' not found")
+        async with self._index_lock():
+            index = await self._load_index(for_update=True)
             
-        # Remove all product files in parallel
-        try:
-            loop = asyncio.get_event_loop()
-            tasks = []
+            # Check which products exist
+            missing_ids = [pid for pid in product_ids if pid not in index]
             
-            for product_id in product_ids:
-                file_path = self._get_file_path(product_id)
-                if os.path.exists(file_path):
-                    tasks.append(loop.run_in_executor(
-                        None,
-                        os.remove,
-                        file_path
-                    ))
-                    
-            await asyncio.gather(*tasks)
-        except (OSError, PermissionError) as e:
-            raise StorageConnectionError(f"Failed to delete products: {e}")
-        
-        # Update the index
-        for product_id in product_ids:
-            del index[product_id]
+            if missing_ids:
+                raise ProductNotFoundError(f"Products with IDs '{', '.join(missing_ids)}' not found")
+                
+            # Remove all product files in parallel
+            try:
+                calls = [(self._get_file_path(product_id),) for product_id in product_ids]
+                await self._gather_io(self._remove_file, calls)
+            except (OSError, PermissionError) as e:
+                raise StorageConnectionError(f"Failed to delete products: {e}")
             
-        await self._save_index(index)
+            # Update the index
+            for product_id in product_ids:
+                del index[product_id]
+                
+            await self._save_index(index)
         
         return len(product_ids)
 
@@ -613,16 +919,22 @@ class JSONStorage(BaseStorage):
         page_size: int = 100,
         sort_by: Optional[str] = None,
         sort_order: str = "asc",
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         List products with optional filtering, pagination, and sorting.
         
+        When every requested field is held in the index, products are
+        projected straight from the index without reading any product files.
+        
         Args:
             filters: Dictionary of field-value pairs to filter products by.
             page: Page number, starting from 1.
             page_size: Number of products per page.
             sort_by: Field to sort products by.
             sort_order: Sort order, either "asc" or "desc".
+            fields: Product fields to include in the results. If None, full
+                    products are returned.
         
         Returns:
             Dict[str, Any]: Dictionary containing:
@@ -638,30 +950,7 @@ class JSONStorage(BaseStorage):
         # Load the index
         index = await self._load_index()
         
-        # Filter the products
-        filtered_product_ids = []
-        for product_id, product_metadata in index.items():
-            if filters and not self._matches_filters(product_metadata, filters):
-                continue
-            filtered_product_ids.append(product_id)
-        
-        # Sort the products
-        if sort_by:
-            def sort_key(product_id):
-                if sort_by == "id":
-                    return product_id
-                elif sort_by.startswith("metadata."):
-                    meta_field = sort_by.split(".", 1)[1]
-                    metadata = index.get(product_id, {}).get("metadata", {})
-                    return metadata.get(meta_field, "")
-                else:
-                    return index.get(product_id, {}).get(sort_by, "")
-                
-            filtered_product_ids = sorted(
-                filtered_product_ids,
-                key=sort_key,
-                reverse=(sort_order.lower() == "desc")
-            )
+        filtered_product_ids = self._query_product_ids(index, filters, sort_by, sort_order)
         
         # Paginate the products
         total = len(filtered_product_ids)
@@ -674,12 +963,33 @@ class JSONStorage(BaseStorage):
         # Get the product data for the paginated IDs
         products = []
         if paginated_product_ids:
-            try:
-                products = await self.get_products(paginated_product_ids)
-            except ProductNotFoundError:
-                # This should not happen because we've already checked that the products exist
-                # But just in case, we'll handle it gracefully
-                products = []
+            if fields is not None and _INDEX_ENTRY_FIELDS.issuperset(fields):
+                # Everything requested is in the index, so skip the product files.
+                # The index is shared with the cache, so copy the projected values
+                # to give callers data they own, as with file reads.
+                products = [
+                    {
+                        field: _copy_json(index[product_id][field])
+                        for field in fields
+                        if field in index[product_id]
+                    }
+                    for product_id in paginated_product_ids
+                ]
+            else:
+                try:
+                    sources = await self.get_products(paginated_product_ids)
+                except ProductNotFoundError:
+                    # This should not happen because we've already checked that the products exist
+                    # But just in case, we'll handle it gracefully
+                    sources = []
+                
+                if fields is None:
+                    products = sources
+                else:
+                    products = [
+                        {field: source[field] for field in fields if field in source}
+                        for source in sources
+                    ]
         
         return {
             "products": products,
@@ -689,25 +999,140 @@ class JSONStorage(BaseStorage):
             "total_pages": total_pages,
         }
 
-    def _matches_filters(self, product_metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    async def iter_products(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "asc",
+        batch_size: int = 100,
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Check if a product's metadata matches the given filters.
+        Iterate over products with optional filtering and sorting.
+        
+        Matching IDs are resolved from the index up front, then product files
+        are read ``batch_size`` at a time, so memory use is bounded by the batch
+        rather than the size of the result set. Products deleted while the
+        iteration is in progress are skipped.
         
         Args:
-            product_metadata: Dictionary containing product metadata.
             filters: Dictionary of field-value pairs to filter products by.
+            sort_by: Field to sort products by.
+            sort_order: Sort order, either "asc" or "desc".
+            batch_size: Number of product files to read at a time.
+        
+        Yields:
+            Dict[str, Any]: The product data.
+        
+        Raises:
+            StorageConnectionError: If there's an error connecting to the storage.
+        """
+        index = await self._load_index()
+        product_ids = self._query_product_ids(index, filters, sort_by, sort_order)
+        
+        for start in range(0, len(product_ids), batch_size):
+            batch_ids = product_ids[start:start + batch_size]
+            try:
+                products = await self.get_products(batch_ids)
+            except ProductNotFoundError:
+                # Some products were deleted after the index was read
+                products = []
+                for product_id in batch_ids:
+                    try:
+                        products.append(await self.get_product(product_id))
+                    except ProductNotFoundError:
+                        continue
+            
+            for product in products:
+                yield product
+
+    def _query_product_ids(
+        self,
+        index: Dict[str, Dict[str, Any]],
+        filters: Optional[Dict[str, Any]],
+        sort_by: Optional[str],
+        sort_order: str,
+    ) -> List[str]:
+        """
+        Resolve the IDs of products matching the filters, in sort order.
+        
+        Args:
+            index: The product index.
+            filters: Dictionary of field-value pairs to filter products by.
+            sort_by: Field to sort products by.
+            sort_order: Sort order, either "asc" or "desc".
         
         Returns:
-            bool: True if the product matches the filters, False otherwise.
+            List[str]: The matching product IDs.
+        """
+        # Filter the products
+        if filters:
+            compiled_filters = self._compile_filters(filters)
+            filtered_product_ids = [
+                product_id
+                for product_id, product_metadata in index.items()
+                if self._matches_filters(product_metadata, compiled_filters)
+            ]
+        else:
+            filtered_product_ids = list(index)
+        
+        # Sort the products
+        if sort_by:
+            # Pick the key function once rather than re-parsing sort_by per product
+            if sort_by == "id":
+                sort_key = None
+            elif sort_by.startswith("metadata."):
+                meta_field = sort_by[len("metadata."):]
+                
+                def sort_key(product_id):
+                    return index[product_id].get("metadata", {}).get(meta_field, "")
+            else:
+                def sort_key(product_id):
+                    return index[product_id].get(sort_by, "")
+            
+            # The list is freshly built above, so sort it in place rather than copying
+            filtered_product_ids.sort(key=sort_key, reverse=(sort_order.lower() == "desc"))
+        
+        return filtered_product_ids
+
+    @staticmethod
+    def _compile_filters(filters: Dict[str, Any]) -> List[Tuple[bool, str, Any]]:
         """
+        Pre-parse filters once per query instead of once per product.
+        
+        Args:
+            filters: Dictionary of field-value pairs to filter products by.
+        
+        Returns:
+            List[Tuple[bool, str, Any]]: (is_metadata_field, field, value) triples.
+        """
+        compiled = []
         for field, value in filters.items():
             if field.startswith("metadata."):
+                compiled.append((True, field[len("metadata."):], value))
+            else:
+                compiled.append((False, field, value))
+        return compiled
+
+    def _matches_filters(
+        self, product_metadata: Dict[str, Any], filters: List[Tuple[bool, str, Any]]
+    ) -> bool:
+        """
+        Check if a product's metadata matches the given filters.
+        
+        Args:
+            product_metadata: Dictionary containing product metadata.
+            filters: Filters compiled by _compile_filters.
+        
+        Returns:
+            bool: True if the product matches the filters, False otherwise.
+        """
+        for is_metadata_field, field, value in filters:
+            if is_metadata_field:
                 # Filter by metadata field
-                meta_field = field.split(".", 1)[1]
-                metadata = product_metadata.get("metadata", {})
-                if meta_field not in metadata or metadata[meta_field] != value:
-                    return False
-            elif field not in product_metadata or product_metadata[field] != value:
+                source = product_metadata.get("metadata", {})
+            else:
+                source = product_metadata
+            if source.get(field, _MISSING) != value:
                 return False
                 
-        return True
\ No newline at end of file
+        return True
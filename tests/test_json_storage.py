@@ -4,6 +4,7 @@ Tests for the JSONStorage class.
 
 import asyncio
 import json
+import math
 import os
 import shutil
 import tempfile
@@ -469,6 +470,62 @@ async def test_index_file_corruption(storage_dir, sample_product):
     assert len(result["products"]) == 0
 
 
+async def test_non_finite_values(storage_dir, sample_product):
+    """Test that NaN is rejected on save but existing NaN data is kept intact."""
+    storage = JSONStorage(storage_dir)
+    
+    nan_product = sample_product.copy()
+    nan_product["price"] = {"current": float("nan"), "currency": "USD"}
+    with pytest.raises(ValueError):
+        await storage.save_product(nan_product)
+    with pytest.raises(ValueError):
+        await storage.save_products([nan_product])
+    assert (await storage.list_products())["total"] == 0
+    
+    # Data written by the standard library may contain NaN literals
+    legacy_product = {"id": "legacy", "title": "Legacy", "metadata": {"score": float("nan")}}
+    with open(os.path.join(storage_dir, "legacy.json"), "w") as f:
+        json.dump(legacy_product, f)
+    with open(storage.index_path, "w") as f:
+        json.dump({"legacy": {"id": "legacy", "title": "Legacy", "metadata": legacy_product["metadata"]}}, f)
+    
+    product = await storage.get_product("legacy")
+    assert math.isnan(product["metadata"]["score"])
+    
+    # Saving another product keeps the existing entry and its value
+    product_id = await storage.save_product(sample_product.copy())
+    index = await storage._load_index()
+    assert set(index) == {"legacy", product_id}
+    assert math.isnan(index["legacy"]["metadata"]["score"])
+    
+    # Updating the product keeps its existing value as well
+    await storage.update_product({"id": "legacy", "title": "Legacy Updated"})
+    product = await storage.get_product("legacy")
+    assert product["title"] == "Legacy Updated"
+    assert math.isnan(product["metadata"]["score"])
+
+
+async def test_values_outside_orjson_range(storage_dir, sample_product):
+    """Test that wide integers and lone surrogates survive a round trip."""
+    storage = JSONStorage(storage_dir)
+    
+    await storage.save_product({"id": "wide", "title": "Wide", "count": 2**70})
+    assert (await storage.get_product("wide"))["count"] == 2**70
+    await storage.update_product({"id": "wide", "title": "Wide Updated"})
+    assert (await storage.get_product("wide"))["count"] == 2**70
+    
+    # An existing index with a lone surrogate can still be written
+    index = await storage._load_index()
+    legacy_index = {"surrogate": {"id": "surrogate", "title": "\ud800", "metadata": {}}, **index}
+    with open(storage.index_path, "w") as f:
+        json.dump(legacy_index, f)
+    
+    product_id = await storage.save_product(sample_product.copy())
+    index = await storage._load_index()
+    assert set(index) == {"surrogate", "wide", product_id}
+    assert index["surrogate"]["title"] == "\ud800"
+
+
 async def test_custom_id_generation(storage):
     """Test custom ID generation logic."""
     # Test product with specific ID
@@ -531,4 +588,136 @@ async def test_complex_filters(storage):
     
     # Test no matches
     result = await storage.list_products(filters={"category": "Clothing"})
-    assert result["total"] == 0
\ No newline at end of file
+    assert result["total"] == 0
+
+
+async def test_index_cache_invalidation(storage_dir, sample_product):
+    """Test that the cached index is refreshed when another instance writes."""
+    storage1 = JSONStorage(storage_dir)
+    storage2 = JSONStorage(storage_dir)
+    
+    await storage1.save_product(sample_product.copy())
+    result = await storage1.list_products()
+    assert result["total"] == 1
+    assert storage1._index_cache is not None
+    
+    # A write through the second instance must be visible to the first
+    other_product = sample_product.copy()
+    other_product["sku"] = "TEST-456"
+    await storage2.save_product(other_product)
+    
+    result = await storage1.list_products()
+    assert result["total"] == 2
+    
+    # Atomic writes must not leave temporary files behind
+    assert not [name for name in os.listdir(storage_dir) if name.endswith(".tmp")]
+
+
+async def test_index_cache_is_not_shared_with_callers(storage, storage_dir, sample_product):
+    """Test that changing returned index data does not leak into the cache or the file."""
+    product_id = await storage.save_product(sample_product.copy())
+    created_at = (await storage.get_product(product_id))["metadata"]["created_at"]
+    
+    # Changes to an index loaded for update stay out of the cache
+    index = await storage._load_index(for_update=True)
+    index[product_id] = {"id": product_id, "title": "changed", "metadata": {}}
+    index["other"] = {"id": "other", "metadata": {}}
+    cached = await storage._load_index()
+    assert set(cached) == {product_id}
+    assert cached[product_id]["title"] == sample_product["title"]
+    
+    result = await storage.list_products(fields=["metadata"])
+    result["products"][0]["metadata"]["created_at"] = "changed"
+    
+    # The next index write must not persist the caller's changes
+    other_product = sample_product.copy()
+    other_product["sku"] = "TEST-456"
+    await storage.save_product(other_product)
+    
+    with open(os.path.join(storage_dir, "index.json")) as f:
+        index = json.load(f)
+    assert index[product_id]["metadata"]["created_at"] == created_at
+    assert index[product_id]["title"] == sample_product["title"]
+
+
+async def test_list_products_projection(storage, batch_products):
+    """Test projecting listed products onto a subset of fields."""
+    await storage.save_products(batch_products)
+    
+    # Indexed fields are served from the index
+    result = await storage.list_products(fields=["id", "title"], sort_by="title")
+    assert result["total"] == 3
+    assert [p["title"] for p in result["products"]] == ["Product 1", "Product 2", "Product 3"]
+    assert all(set(p) == {"id", "title"} for p in result["products"])
+    
+    # Projected index data belongs to the caller
+    result = await storage.list_products(fields=["metadata"], page_size=1)
+    result["products"][0]["metadata"]["created_at"] = "changed"
+    result = await storage.list_products(fields=["metadata"], page_size=1)
+    assert result["products"][0]["metadata"]["created_at"] != "changed"
+    
+    # Non-indexed fields are read from the product files
+    result = await storage.list_products(fields=["title", "price"], sort_by="title")
+    assert result["products"][0] == {
+        "title": "Product 1",
+        "price": {"current": 10.99, "currency": "USD"},
+    }
+
+
+async def test_iter_products(storage, batch_products):
+    """Test streaming products in batches."""
+    product_ids = await storage.save_products(batch_products)
+    
+    titles = [
+        product["title"]
+        async for product in storage.iter_products(sort_by="title", sort_order="desc", batch_size=2)
+    ]
+    assert titles == ["Product 3", "Product 2", "Product 1"]
+    
+    # Filters are applied from the index
+    products = [p async for p in storage.iter_products(filters={"sku": "SKU-002"})]
+    assert [p["title"] for p in products] == ["Product 2"]
+    
+    # Products deleted mid-iteration are skipped
+    iterator = storage.iter_products(sort_by="title", batch_size=1)
+    first = await iterator.__anext__()
+    await storage.delete_product(product_ids[1])
+    remaining = [p["title"] async for p in iterator]
+    assert first["title"] == "Product 1"
+    assert remaining == ["Product 3"]
+
+
+async def test_url_id_is_stable(storage):
+    """Test that URL-based IDs are deterministic and distinguish fragments."""
+    product_id = await storage.save_product(
+        {"url": "https://example.com/#/product/1", "title": "URL Product"}
+    )
+    
+    expected = storage._get_product_id({"url": "https://example.com/#/product/1"})
+    assert product_id == expected
+    assert product_id.startswith("url_")
+    
+    # Hash-routed pages are different products
+    other_id = await storage.save_product(
+        {"url": "https://example.com/#/product/2", "title": "Other URL Product"}
+    )
+    assert other_id != product_id
+    
+    with pytest.raises(DuplicateProductError):
+        await storage.save_product({"url": "https://example.com/#/product/1"})
+
+
+async def test_list_products_sort_keys(storage, batch_products):
+    """Test sorting by ID, indexed fields and metadata fields."""
+    await storage.save_products(batch_products)
+    
+    result = await storage.list_products(sort_by="id", sort_order="desc")
+    ids = [p["id"] for p in result["products"]]
+    assert ids == sorted(ids, reverse=True)
+    
+    result = await storage.list_products(sort_by="sku")
+    assert [p["sku"] for p in result["products"]] == ["SKU-001", "SKU-002", "SKU-003"]
+    
+    await storage.update_product({"id": ids[-1], "title": "Touched"})
+    result = await storage.list_products(sort_by="metadata.updated_at", sort_order="desc")
+    assert result["products"][0]["id"] == ids[-1]
@@ -4,6 +4,8 @@ Tests for batch operations in JSONStorage.
 
 import asyncio
 import os
+import threading
+import time
 import pytest
 import json
 import tempfile
@@ -349,6 +351,155 @@ async def test_batch_operations_performance(storage):
     await storage.delete_products(batch_ids)
 
 
+@pytest.mark.asyncio
+async def test_batch_operations_bounded_concurrency(test_dir):
+    """Test that batch operations respect max_concurrency."""
+    storage = JSONStorage(test_dir, max_concurrency=2)
+    active = 0
+    peak = 0
+    counter_lock = threading.Lock()
+    write_json_file = storage._write_json_file
+    
+    def tracking_write(path, data, *args):
+        nonlocal active, peak
+        with counter_lock:
+            active += 1
+            peak = max(peak, active)
+        try:
+            time.sleep(0.01)
+            write_json_file(path, data, *args)
+        finally:
+            with counter_lock:
+                active -= 1
+    
+    storage._write_json_file = tracking_write
+    products = [{"name": f"Product {i}", "id": f"bounded-{i}"} for i in range(10)]
+    product_ids = await storage.save_products(products)
+    
+    assert len(product_ids) == 10
+    assert 1 <= peak <= 2
+    retrieved = await storage.get_products(product_ids)
+    assert [p["name"] for p in retrieved] == [p["name"] for p in products]
+
+
+@pytest.mark.asyncio
+async def test_save_products_stops_on_failure(test_dir):
+    """Test that a failed write cancels queued writes and leaves the index untouched."""
+    storage = JSONStorage(test_dir, max_concurrency=1)
+    write_json_file = storage._write_json_file
+    started = []
+    
+    def failing_write(path, data, *args):
+        started.append(data["id"])
+        if data.get("id") == "fail-1":
+            raise OSError("disk full")
+        write_json_file(path, data, *args)
+    
+    storage._write_json_file = failing_write
+    products = [{"name": f"Product {i}", "id": f"fail-{i}"} for i in range(5)]
+    
+    with pytest.raises(StorageConnectionError):
+        await storage.save_products(products)
+    
+    # Writes still queued behind the failure were never started
+    assert started == ["fail-0", "fail-1"]
+    
+    # The index was not updated
+    result = await storage.list_products()
+    assert result["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_save_products_failure_leaves_no_files(test_dir):
+    """Test that writes already running when a batch fails are waited for and removed."""
+    storage = JSONStorage(test_dir, max_concurrency=8)
+    write_json_file = storage._write_json_file
+    
+    def failing_write(path, data, *args):
+        if data.get("id") == "fail-0":
+            raise OSError("disk full")
+        time.sleep(0.05)
+        write_json_file(path, data, *args)
+    
+    storage._write_json_file = failing_write
+    products = [{"name": f"Product {i}", "id": f"fail-{i}"} for i in range(6)]
+    
+    with pytest.raises(StorageConnectionError):
+        await storage.save_products(products)
+    
+    # Give any stray worker threads time to finish before checking
+    await asyncio.sleep(0.1)
+    assert not [name for name in os.listdir(test_dir) if name.startswith("fail-")]
+    assert (await storage.list_products())["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_save_products_cancelled_leaves_no_files(test_dir):
+    """Test that cancelling a batch save waits for running writes and removes them."""
+    storage = JSONStorage(test_dir, max_concurrency=2)
+    write_json_file = storage._write_json_file
+    
+    def slow_write(path, data, *args):
+        time.sleep(0.05)
+        write_json_file(path, data, *args)
+    
+    storage._write_json_file = slow_write
+    products = [{"name": f"Product {i}", "id": f"cancel-{i}"} for i in range(6)]
+    
+    task = asyncio.ensure_future(storage.save_products(products))
+    await asyncio.sleep(0.02)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    
+    assert not storage.lock.locked()
+    
+    # Give any stray worker threads time to finish before checking
+    await asyncio.sleep(0.15)
+    assert not [name for name in os.listdir(test_dir) if name.startswith("cancel-")]
+    assert (await storage.list_products())["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_save_products_unexpected_failure_leaves_no_files(test_dir):
+    """Test that written files are removed when a batch fails with a non-I/O error."""
+    storage = JSONStorage(test_dir)
+    write_json_file = storage._write_json_file
+    
+    def failing_write(path, data, *args):
+        if data.get("id") == "fail-2":
+            raise TypeError("not serializable")
+        write_json_file(path, data, *args)
+    
+    storage._write_json_file = failing_write
+    products = [{"name": f"Product {i}", "id": f"fail-{i}"} for i in range(4)]
+    
+    with pytest.raises(TypeError):
+        await storage.save_products(products)
+    
+    assert not [name for name in os.listdir(test_dir) if name.startswith("fail-")]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_saves_keep_every_index_entry(storage, sample_products):
+    """Test that concurrent single saves do not overwrite each other's index entries."""
+    products = []
+    for i in range(20):
+        product = sample_products[0].copy()
+        product["sku"] = f"CONCURRENT{i:03d}"
+        product["url"] = f"https://example.com/concurrent/{i}"
+        products.append(product)
+    
+    product_ids = await asyncio.gather(*(storage.save_product(p) for p in products))
+    
+    index = await storage._load_index()
+    assert set(product_ids) <= set(index)
+    
+    # Deleting concurrently must leave the index empty as well
+    await asyncio.gather(*(storage.delete_product(pid) for pid in product_ids))
+    assert await storage._load_index() == {}
+
+
 @pytest.mark.asyncio
 async def test_mixed_batch_operations(storage, sample_products):
     """Test performing multiple types of batch operations in sequence."""
@@ -0,0 +1,60 @@
+"""
+Tests for the storage factory.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from crawl4ai_llm.config import StorageConfig
+from crawl4ai_llm.storage.factory import get_storage
+from crawl4ai_llm.storage.json_storage import JSONStorage
+
+
+@pytest.fixture
+def storage_dir():
+    """Temporary directory for storage tests."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    # Clean up after the test
+    shutil.rmtree(temp_dir)
+
+
+async def test_get_storage_json(storage_dir):
+    """Test creating a JSON storage instance from configuration."""
+    storage = await get_storage(StorageConfig(type="json", path=storage_dir))
+    assert isinstance(storage, JSONStorage)
+    assert storage.directory == storage_dir
+
+
+async def test_get_storage_reuses_instance(storage_dir):
+    """Test that storage instances are pooled per type and path."""
+    other_dir = tempfile.mkdtemp()
+    try:
+        storage1 = await get_storage(StorageConfig(type="json", path=storage_dir))
+        storage2 = await get_storage(StorageConfig(type="JSON", path=storage_dir))
+        storage3 = await get_storage(StorageConfig(type="json", path=other_dir))
+        
+        assert storage1 is storage2
+        assert storage3 is not storage1
+        assert storage3.directory == other_dir
+    finally:
+        shutil.rmtree(other_dir)
+
+
+async def test_get_storage_reuses_instance_for_equivalent_paths(storage_dir, monkeypatch):
+    """Test that different spellings of the same path share one instance."""
+    monkeypatch.chdir(os.path.dirname(storage_dir))
+    relative_dir = os.path.basename(storage_dir)
+    
+    storage = await get_storage(StorageConfig(type="json", path=storage_dir))
+    for path in (storage_dir + os.sep, relative_dir, os.path.join(".", relative_dir)):
+        assert await get_storage(StorageConfig(type="json", path=path)) is storage
+
+
+async def test_get_storage_unknown_type(storage_dir):
+    """Test that an unknown storage type raises ValueError."""
+    with pytest.raises(ValueError):
+        await get_storage(StorageConfig(type="unknown", path=storage_dir))